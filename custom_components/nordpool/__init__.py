@@ -55,6 +55,7 @@ class NordpoolData:
         self._data = defaultdict(dict)
         self.currency = []
         self.listeners = []
+        self._spots = {}
 
     async def _update(self, type_="today", dt=None):
         _LOGGER.debug("calling _update %s %s", type_, dt)
@@ -69,7 +70,10 @@ class NordpoolData:
         # as we request data for 3 days anyway.
         # Keeping this for now, but this should be changed.
         for currency in self.currency:
-            spot = AioPrices(currency, client)
+            # Keep one client per currency so its page cache is reused.
+            spot = self._spots.get(currency)
+            if spot is None:
+                spot = self._spots[currency] = AioPrices(currency, client)
             data = await spot.hourly(end_date=dt)
             if data:
                 self._data[currency][type_] = data["areas"]
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from collections import defaultdict
 from datetime import date, datetime, timedelta
 
@@ -13,6 +14,22 @@ from .misc import add_junk, exceptions_raiser
 
 _LOGGER = logging.getLogger(__name__)
 
+try:
+    import simdjson
+
+    # Reused between requests so simdjson can keep its padded input buffer.
+    _PARSER = simdjson.Parser()
+except ImportError:
+    _PARSER = None
+    try:
+        import orjson
+
+        _loads = orjson.loads
+    except ImportError:
+        import json
+
+        _loads = json.loads
+
 
 tzs = {
     "DK1": "Europe/Copenhagen",
@@ -40,6 +57,14 @@ tzs = {
     "DE-LU": "Europe/Berlin",
 }
 
+_TZ_CACHE = {k: tz.gettz(v) for k, v in tzs.items()}
+
+# The api pages are for a day in cet.
+_CET = tz.gettz("Europe/Stockholm")
+
+# Maps upper cased area names to the names used by the api.
+_AREA_NAMES = {k.upper(): k for k in tzs}
+
 
 # List of page index for hourly data
 # Some are disabled as they don't contain the other currencies, NOK etc,
@@ -90,7 +115,15 @@ AREA_TO_COUNTRY = {
     "PL ": "PL",
 }
 
-INVALID_VALUES = frozenset((None, float("inf")))
+_INF = float("inf")
+
+_FLOAT_TRANS = str.maketrans({",": ".", " ": None})
+
+
+# How long a fetched page is reused. Pages for past days don't change
+# anymore, today and tomorrow can still be published or corrected.
+CACHE_TTL_PAST = 24 * 3600
+CACHE_TTL = 15 * 60
 
 
 class InvalidValueException(ValueError):
@@ -106,69 +139,110 @@ def join_result_for_correct_time(results, dt):
     # _LOGGER.debug("join_result_for_correct_time %s", dt)
     utc = dt
 
+    areas_seen = {k for day_ in results for k in day_.get("areas", {}) if k in tzs}
+    if areas_seen:
+        fin["areas"] = {k: {"values": []} for k in areas_seen}
+
     for day_ in results:
         for key, value in day_.get("areas", {}).items():
-            zone = tzs.get(key)
+            zone = _TZ_CACHE.get(key)
             if zone is None:
                 _LOGGER.debug("Skipping %s", key)
                 continue
-            else:
-                zone = tz.gettz(zone)
+
+            values = value.pop("values")
+            area = fin["areas"][key]
 
             # We add junk here as the peak etc
             # from the api is based on cet, not the
             # hours in the we want so invalidate them
             # its later corrected in the sensor.
-            value = add_junk(value)
+            # Its the same junk for every day so only do it once.
+            if "Average" not in area:
+                area.update(add_junk(value))
 
-            values = day_["areas"][key].pop("values")
-
-            # We need to check this so we dont overwrite stuff.
-            if key not in fin["areas"]:
-                fin["areas"][key] = {}
-            fin["areas"][key].update(value)
-            if "values" not in fin["areas"][key]:
-                fin["areas"][key]["values"] = []
-
-            start_of_day = utc.astimezone(zone).replace(
+            local = utc.astimezone(zone)
+            start_of_day = local.replace(
                 hour=0, minute=0, second=0, microsecond=0
-            )
-            end_of_day = utc.astimezone(zone).replace(
+            ).astimezone(tz.UTC)
+            end_of_day = local.replace(
                 hour=23, minute=59, second=59, microsecond=999999
-            )
-
-            for val in values:
-                local = val["start"].astimezone(zone)
-                local_end = val["end"].astimezone(zone)
-                if start_of_day <= local and local <= end_of_day:
-                    if val['value'] in INVALID_VALUES:
-                        raise InvalidValueException()
-                    if local == local_end:
-                        _LOGGER.info(
-                            "Hour has the same start and end, most likly due to dst change %s exluded this hour",
-                            val,
-                        )
-                    else:
-                        fin["areas"][key]["values"].append(val)
+            ).astimezone(tz.UTC)
+
+            # The values are tz aware, so compare them in utc
+            # instead of converting every value to the local zone.
+            in_day = [
+                val for val in values if start_of_day <= val["start"] <= end_of_day
+            ]
+            area_values = area["values"]
+            for val in in_day:
+                v = val["value"]
+                # v != v catches nan.
+                if v is None or v == _INF or v != v:
+                    raise InvalidValueException()
+                if val["start"] == val["end"]:
+                    _LOGGER.info(
+                        "Hour has the same start and end, most likly due to dst change %s exluded this hour",
+                        val,
+                    )
+                else:
+                    area_values.append(val)
 
     return fin
 
 
 class AioPrices(Prices):
-    """Interface"""
+    """Interface
+
+    client should be a long lived aiohttp.ClientSession so connections to
+    the api are kept alive between fetches. If it is None a session with
+    a keep-alive connector is created on the first request, call close()
+    when done to close it. A client that is passed in is never closed.
+
+    If skip_unused_days is set, yesterdays page isn't fetched when a single
+    area in the cet zone is requested for today.
+    """
 
-    def __init__(self, currency, client, timeezone=None):
+    def __init__(self, currency, client=None, timeezone=None, skip_unused_days=False):
         super().__init__(currency)
         self.client = client
+        self._own_client = False
         self.timeezone = timeezone
+        self.skip_unused_days = skip_unused_days
+        self._cache = {}
         self.API_URL_CURRENCY = "https://www.nordpoolgroup.com/api/marketdata/page/%s"
 
     async def _io(self, url, **kwargs):
+        if self.client is None:
+            self.client = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=4, keepalive_timeout=75, ttl_dns_cache=300
+                )
+            )
+            self._own_client = True
 
         resp = await self.client.get(url, params=kwargs)
         _LOGGER.debug("requested %s %s", resp.url, kwargs)
 
-        return await resp.json()
+        data = await resp.read()
+        if _PARSER is None:
+            return _loads(data)
+        # Prices._parse_json only reads "currency" and the "data" subtree,
+        # so skip materialising the page config and headers.
+        doc = _PARSER.parse(data)
+        try:
+            return {"currency": doc["currency"], "data": doc["data"].as_dict()}
+        finally:
+            # simdjson won't reuse the parser while the document is alive,
+            # which a traceback holding this frame would do.
+            del doc
+
+    async def close(self):
+        """Close the session if it was created by us."""
+        if self._own_client:
+            await self.client.close()
+            self.client = None
+            self._own_client = False
 
     async def _fetch_json(self, data_type, end_date=None):
         """Fetch JSON from API"""
@@ -179,18 +253,37 @@ class AioPrices(Prices):
         if not isinstance(end_date, date) and not isinstance(end_date, datetime):
             end_date = parse_dt(end_date)
 
-        return await self._io(
+        end = end_date.strftime("%d-%m-%Y")
+        key = (data_type, end, self.currency)
+        now = time.monotonic()
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        ttl = CACHE_TTL_PAST if end_date < date.today() else CACHE_TTL
+
+        cached = self._cache.get(key)
+        if cached is not None and now - cached[0] < ttl:
+            _LOGGER.debug("Using cached data for %s", key)
+            return cached[1]
+
+        data = await self._io(
             self.API_URL % data_type,
             currency=self.currency,
-            endDate=end_date.strftime("%d-%m-%Y"),
+            endDate=end,
         )
-
-    # Add more exceptions as we find them. KeyError is raised when the api return
-    # junk due to currency not being available in the data.
+        # Drop pages that can't be served anymore so the cache doesn't grow.
+        for k in [k for k, v in self._cache.items() if now - v[0] >= CACHE_TTL_PAST]:
+            del self._cache[k]
+        self._cache[key] = (now, data)
+        return data
+
+    # Only retry transient network errors. KeyError is raised when the api
+    # return junk due to currency not being available in the data, retrying
+    # won't fix that so it is raised right away.
     @backoff.on_exception(
         backoff.expo,
-        (aiohttp.ClientError, KeyError),
-        logger=_LOGGER, max_value=20, max_time=60)
+        aiohttp.ClientError,
+        logger=_LOGGER, max_tries=3, max_time=30,
+        jitter=backoff.full_jitter, base=2, factor=1.0)
     async def fetch(self, data_type, end_date=None, areas=None):
         """
         Fetch data from API.
@@ -214,23 +307,61 @@ class AioPrices(Prices):
         """
         if areas is None:
             areas = []
+        # Normalise the requested areas once, the api names are case sensitive.
+        areas = list(dict.fromkeys(_AREA_NAMES.get(a.upper(), a) for a in areas))
 
-        yesterday = datetime.now() - timedelta(days=1)
         today = datetime.now()
-        tomorrow = datetime.now() + timedelta(days=1)
+        yesterday = today - timedelta(days=1)
+        tomorrow = today + timedelta(days=1)
+
+        async def _fetch_and_parse(dt):
+            # Parse each page as soon as it arrives, while
+            # the others are still being fetched.
+            res = await self._fetch_json(data_type, dt)
+            return self._parse_json(res, areas)
 
-        jobs = [
-            self._fetch_json(data_type, yesterday),
-            self._fetch_json(data_type, today),
-            self._fetch_json(data_type, tomorrow),
-        ]
+        days = [yesterday, today, tomorrow]
+        if self._skip_yesterday(end_date, areas, today):
+            _LOGGER.debug("Skipping yesterday for %s", areas)
+            days.remove(yesterday)
 
-        res = await asyncio.gather(*jobs)
+        jobs = [_fetch_and_parse(day) for day in days]
+
+        try:
+            raw = await asyncio.gather(*jobs)
+        except KeyError:
+            # Retrying won't help, but don't cache the junk either.
+            _LOGGER.warning(
+                "Failed to parse %s data for currency %s", data_type, self.currency
+            )
+            self._cache.clear()
+            raise
 
-        raw = [self._parse_json(i, areas) for i in res]
         # Just to test should be removed
         # exceptions_raiser()
-        return join_result_for_correct_time(raw, end_date)
+        try:
+            return join_result_for_correct_time(raw, end_date)
+        except InvalidValueException:
+            # Don't keep serving pages that aren't complete yet.
+            self._cache.clear()
+            raise
+
+    def _skip_yesterday(self, end_date, areas, now):
+        """Check if yesterdays page has no hours for the requested day.
+
+        Only if the areas local day is the day of todays page, which is
+        requested for now's date, and the area is in cet. Zones ahead of
+        cet still need the last hours of yesterdays page.
+        """
+        if not self.skip_unused_days or len(areas) != 1 or end_date is None:
+            return False
+        zone = _TZ_CACHE.get(areas[0])
+        if zone is None or not isinstance(end_date, datetime):
+            return False
+        local = end_date.astimezone(zone)
+        if local.date() != now.date():
+            return False
+        return local.utcoffset() == local.astimezone(_CET).utcoffset()
 
     async def hourly(self, end_date=None, areas=None):
         """Helper to fetch hourly data, see Prices.fetch()"""
@@ -265,6 +396,6 @@ class AioPrices(Prices):
     def _conv_to_float(self, s):
         """Convert numbers to float. Return infinity, if conversion fails."""
         try:
-            return float(s.replace(",", ".").replace(" ", ""))
-        except ValueError:
+            return float(s.translate(_FLOAT_TRANS))
+        except (ValueError, AttributeError):
             return float("inf")
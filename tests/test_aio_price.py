@@ -0,0 +1,265 @@
+import asyncio
+import json
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from dateutil import tz
+
+from custom_components.nordpool import NordpoolData, aio_price
+from custom_components.nordpool.aio_price import AioPrices
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.url = "https://www.nordpoolgroup.com/api/marketdata/page/10"
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+
+class FakeClient:
+    """Returns the same recorded page for every request."""
+
+    def __init__(self, body):
+        self.body = body
+        self.requests = []
+        self.closed = False
+
+    async def get(self, url, **kwargs):
+        self.requests.append(kwargs["params"])
+        return FakeResponse(self.body)
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def hourly_page():
+    return (FIXTURES / "hourly_page.json").read_bytes()
+
+
+@pytest.mark.parametrize("use_simdjson", [True, False])
+def test_io_output_parses(hourly_page, monkeypatch, use_simdjson):
+    if use_simdjson:
+        if aio_price._PARSER is None:
+            pytest.skip("simdjson is not installed")
+    else:
+        monkeypatch.setattr(aio_price, "_PARSER", None)
+        monkeypatch.setattr(aio_price, "_loads", json.loads, raising=False)
+
+    spot = AioPrices("EUR", FakeClient(hourly_page))
+    data = asyncio.run(spot._io(spot.API_URL % spot.HOURLY))
+    parsed = spot._parse_json(data, ["SE3", "FI"])
+
+    assert parsed["currency"] == "EUR"
+    assert sorted(parsed["areas"]) == ["FI", "SE3"]
+    assert len(parsed["areas"]["SE3"]["values"]) == 24
+    assert parsed["areas"]["SE3"]["values"][0]["value"] == 40.0
+    assert parsed["areas"]["FI"]["Max"] == 73.0
+
+
+@pytest.mark.parametrize("body", [b'{"data": {"Rows": []}}', b'{"currency": "EUR"}'])
+def test_io_junk_does_not_lock_parser(hourly_page, body):
+    spot = AioPrices("EUR", FakeClient(body))
+    with pytest.raises(KeyError):
+        asyncio.run(spot._io(spot.API_URL % spot.HOURLY))
+
+    spot.client = FakeClient(hourly_page)
+    data = asyncio.run(spot._io(spot.API_URL % spot.HOURLY))
+    assert data["currency"] == "EUR"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(aio_price, "time", clock)
+    return clock
+
+
+def test_cache_reused_within_ttl(hourly_page, clock):
+    client = FakeClient(hourly_page)
+    spot = AioPrices("EUR", client)
+    end_date = datetime(2026, 10, 15, 12, tzinfo=tz.UTC)
+
+    asyncio.run(spot.hourly(end_date=end_date))
+    clock.now += aio_price.CACHE_TTL - 1
+    asyncio.run(spot.hourly(end_date=end_date))
+
+    assert len(client.requests) == 3
+
+
+def test_cache_ttl_past_and_today(hourly_page, clock):
+    client = FakeClient(hourly_page)
+    spot = AioPrices("EUR", client)
+    past = date.today() - timedelta(days=2)
+    today = date.today()
+
+    async def fetch_both():
+        await spot._fetch_json(spot.HOURLY, past)
+        await spot._fetch_json(spot.HOURLY, today)
+
+    asyncio.run(fetch_both())
+    clock.now += aio_price.CACHE_TTL
+    asyncio.run(fetch_both())
+
+    # Only todays page is fetched again.
+    assert [r["endDate"] for r in client.requests] == [
+        past.strftime("%d-%m-%Y"),
+        today.strftime("%d-%m-%Y"),
+        today.strftime("%d-%m-%Y"),
+    ]
+
+
+def test_cache_evicts_old_pages(hourly_page, clock):
+    spot = AioPrices("EUR", FakeClient(hourly_page))
+    past = date.today() - timedelta(days=2)
+    today = date.today()
+
+    asyncio.run(spot._fetch_json(spot.HOURLY, past))
+    clock.now += aio_price.CACHE_TTL_PAST
+    asyncio.run(spot._fetch_json(spot.HOURLY, today))
+
+    assert list(spot._cache) == [(spot.HOURLY, today.strftime("%d-%m-%Y"), "EUR")]
+
+
+def test_cache_cleared_on_invalid_value(hourly_page):
+    # SE3s first hour can't be converted to a float.
+    spot = AioPrices("EUR", FakeClient(hourly_page.replace(b'"40,00"', b'"-"')))
+
+    with pytest.raises(aio_price.InvalidValueException):
+        asyncio.run(spot.hourly(end_date=datetime(2026, 10, 15, 12, tzinfo=tz.UTC)))
+
+    assert spot._cache == {}
+
+
+def test_update_reuses_prices_per_currency(hourly_page, monkeypatch):
+    client = FakeClient(hourly_page)
+    monkeypatch.setattr(
+        "custom_components.nordpool.async_get_clientsession", lambda hass: client
+    )
+    api = NordpoolData(None)
+    api.currency.append("EUR")
+    dt = datetime(2026, 10, 15, 12, tzinfo=tz.UTC)
+
+    async def update():
+        await api._update("today", dt)
+        await api._update("tomorrow", dt)
+
+    asyncio.run(update())
+
+    assert len(client.requests) == 3
+    assert list(api._spots) == ["EUR"]
+    assert "SE3" in api._data["EUR"]["tomorrow"]
+
+
+def test_fetch_junk_is_raised_without_retry():
+    client = FakeClient(b'{"currency": "EUR", "data": {}}')
+    spot = AioPrices("EUR", client)
+
+    with pytest.raises(KeyError):
+        asyncio.run(spot.hourly(end_date=datetime.now(tz.UTC)))
+
+    assert len(client.requests) == 3
+    assert spot._cache == {}
+
+
+def test_close_only_closes_own_session(hourly_page, monkeypatch):
+    own = FakeClient(hourly_page)
+    monkeypatch.setattr(aio_price.aiohttp, "TCPConnector", lambda **kwargs: None)
+    monkeypatch.setattr(aio_price.aiohttp, "ClientSession", lambda **kwargs: own)
+    passed = FakeClient(hourly_page)
+
+    async def run():
+        for spot in (AioPrices("EUR"), AioPrices("EUR", passed)):
+            await spot._io(spot.API_URL % spot.HOURLY)
+            await spot.close()
+
+    asyncio.run(run())
+
+    assert own.closed
+    assert not passed.closed
+
+
+def test_join_rejects_nan():
+    start = datetime(2026, 10, 15, 10, tzinfo=tz.UTC)
+    value = {"start": start, "end": start + timedelta(hours=1), "value": float("nan")}
+    raw = [{"areas": {"SE3": {"values": [value]}}}]
+
+    with pytest.raises(aio_price.InvalidValueException):
+        aio_price.join_result_for_correct_time(raw, start)
+
+
+def test_join_adds_junk_and_keeps_local_day(hourly_page):
+    spot = AioPrices("EUR", FakeClient(hourly_page))
+    data = asyncio.run(spot._io(spot.API_URL % spot.HOURLY))
+    raw = [spot._parse_json(data, ["SE3", "FI"])]
+
+    fin = aio_price.join_result_for_correct_time(
+        raw, datetime(2026, 10, 15, 12, tzinfo=tz.UTC)
+    )
+
+    assert fin["areas"]["SE3"]["Max"] == float("inf")
+    assert fin["areas"]["FI"]["Average"] == float("inf")
+    assert len(fin["areas"]["SE3"]["values"]) == 24
+    # Finlands day starts an hour earlier, that hour is on yesterdays page.
+    assert len(fin["areas"]["FI"]["values"]) == 23
+
+
+def test_fetch_normalises_areas(hourly_page):
+    spot = AioPrices("EUR", FakeClient(hourly_page))
+    seen = []
+    parse_json = spot._parse_json
+
+    def _parse_json(data, areas):
+        seen.append(areas)
+        return parse_json(data, areas)
+
+    spot._parse_json = _parse_json
+    fin = asyncio.run(
+        spot.hourly(
+            end_date=datetime(2026, 10, 15, 12, tzinfo=tz.UTC), areas=["oslo", "OSLO"]
+        )
+    )
+
+    assert seen[0] == ["Oslo"]
+    assert list(fin["areas"]) == ["Oslo"]
+
+
+@pytest.mark.parametrize(
+    "now, end_date, area, requests",
+    [
+        # Midday in a cet area, todays page holds the whole day.
+        ("2026-10-15T12:00", "2026-10-15T12:00+02:00", "SE3", 2),
+        # Finland starts its day on yesterdays page.
+        ("2026-10-15T12:00", "2026-10-15T12:00+03:00", "FI", 3),
+        # System zone ahead of cet just after midnight, SE3 is still on
+        # the 15th which is yesterdays page.
+        ("2026-10-16T00:30", "2026-10-16T00:30+03:00", "SE3", 3),
+    ],
+)
+def test_skip_unused_days(hourly_page, monkeypatch, now, end_date, area, requests):
+    class FixedDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromisoformat(now)
+
+    monkeypatch.setattr(aio_price, "datetime", FixedDatetime)
+    client = FakeClient(hourly_page)
+    spot = AioPrices("EUR", client, skip_unused_days=True)
+
+    end_date = FixedDatetime.fromisoformat(end_date)
+    asyncio.run(spot.hourly(end_date=end_date, areas=[area]))
+
+    assert len(client.requests) == requests